@@ -6,6 +6,7 @@ ABC Measure Collection Demo - Extract collections of notes organized by measures
 import os
 import sys
 import music21 as m21
+import numpy as np
 
 from splyne.input_handling.tunes_reader import AbcReader
 from splyne.input_handling.note import Note
@@ -15,9 +16,16 @@ from splyne.input_handling.melody import Melody
 class MeasureCollection:
     """A collection of notes that represent one measure."""
 
+    __slots__ = ('measure_number', 'notes', '_pitches', '_durations')
+
     def __init__(self, measure_number, notes):
         self.measure_number = measure_number
         self.notes = notes
+        # Keep pitch/duration in numpy arrays so per-measure queries run as
+        # C-level reductions instead of Python generator loops.
+        count = len(notes)
+        self._pitches = np.fromiter((note.pitch for note in notes), dtype=np.int16, count=count)
+        self._durations = np.fromiter((note.duration for note in notes), dtype=np.float32, count=count)
 
     def __str__(self):
         note_strs = [f"({note.pitch},{note.duration})" for note in self.notes]
@@ -26,11 +34,11 @@ class MeasureCollection:
 
     def get_pitches(self):
         """Get just the pitches from this measure."""
-        return [note.pitch for note in self.notes]
+        return self._pitches.tolist()
 
     def get_total_duration(self):
         """Calculate the total duration of all notes in this measure."""
-        return sum(note.duration for note in self.notes)
+        return float(self._durations.sum())
 
 
 def extract_measures_from_abc(abc_file_path):
@@ -93,15 +101,16 @@ def extract_measures_from_abc(abc_file_path):
             # Create one big "measure" with all notes if we can't find measure structure
             if all_notes:
                 measure_notes = []
-                for element in all_notes:
-                    if isinstance(element, m21.note.Note):
-                        note = Note(
-                            pitch=element.pitch.midi,
-                            onset=element.offset,
-                            duration=element.quarterLength,
-                            rest_fraction=0.0
-                        )
-                        measure_notes.append(note)
+                # Typed accessor: music21 filters by class internally, so no
+                # per-element isinstance check is needed.
+                for element in all_notes.getElementsByClass(m21.note.Note):
+                    note = Note(
+                        pitch=element.pitch.midi,
+                        onset=element.offset,
+                        duration=element.quarterLength,
+                        rest_fraction=0.0
+                    )
+                    measure_notes.append(note)
 
                 if measure_notes:
                     measure_collection = MeasureCollection(1, measure_notes)
@@ -112,27 +121,33 @@ def extract_measures_from_abc(abc_file_path):
         for i, measure in enumerate(measures):
             measure_notes = []
 
-            # Extract notes from this measure
-            for element in measure.notes:
-                if isinstance(element, m21.note.Note):
-                    note = Note(
-                        pitch=element.pitch.midi,
-                        onset=element.offset,
-                        duration=element.quarterLength,
-                        rest_fraction=0.0  # ABC reader doesn't calculate rest fractions like MIDI
-                    )
-                    measure_notes.append(note)
+            # Extract notes from this measure via the typed accessor instead
+            # of an isinstance check over the mixed-type stream
+            for element in measure.getElementsByClass(m21.note.Note):
+                note = Note(
+                    pitch=element.pitch.midi,
+                    onset=element.offset,
+                    duration=element.quarterLength,
+                    rest_fraction=0.0  # ABC reader doesn't calculate rest fractions like MIDI
+                )
+                measure_notes.append(note)
 
             if measure_notes:  # Only add measures that have notes
-                measure_collection = MeasureCollection(i + 1, measure_notes)
-
-                # Validate measure duration if we have time signature info
-                if expected_duration is not None:
-                    actual_duration = measure_collection.get_total_duration()
-                    if abs(actual_duration - expected_duration) > 0.01:  # Allow small floating point differences
-                        print(f"  WARNING: Measure {i+1} duration {actual_duration} != expected {expected_duration}")
-
-                measure_collections.append(measure_collection)
+                measure_collections.append(MeasureCollection(i + 1, measure_notes))
+
+        # Validate all measure durations in one vectorized check and emit a
+        # single summary warning instead of one print per bad measure.
+        if expected_duration is not None and measure_collections:
+            durations = np.fromiter(
+                (m.get_total_duration() for m in measure_collections),
+                dtype=np.float32, count=len(measure_collections)
+            )
+            bad_idx = np.nonzero(np.abs(durations - expected_duration) > 0.01)[0]
+            if bad_idx.size:
+                details = ", ".join(
+                    f"{measure_collections[i].measure_number} ({durations[i]})" for i in bad_idx
+                )
+                print(f"  WARNING: {bad_idx.size} measures != expected duration {expected_duration}: {details}")
 
         return measure_collections
 
@@ -3,16 +3,102 @@ This module implements the NGram class for generating and representing n-grams f
 An NGram represents a sequence of Note objects and provides methods for n-gram operations.
 """
 
-from typing import List
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
 from ..input_handling.note import Note
 from ..input_handling.melody import Melody
 
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # numba is an optional speed-up; fall back to pure Python
+    _HAVE_NUMBA = False
+
+# 64-bit FNV-1a constants used for n-gram fingerprinting.
+_FNV_OFFSET = 1469598103934665603
+_FNV_PRIME = 1099511628211
+
+# Rendered "{pitch,duration,rest_fraction}" tokens keyed by the note
+# fields. N-gram windows overlap heavily, so each distinct note is
+# formatted once; the cache is cleared if it ever grows past the bound.
+_TOKEN_CACHE: Dict[tuple, str] = {}
+_TOKEN_CACHE_MAX = 65536
+
+
+def _format_token(pitch, duration, rest_fraction) -> str:
+    """
+    Returns the cached "{pitch,duration,rest_fraction}" token for a note.
+
+    Args:
+        pitch: MIDI pitch of the note.
+        duration: Duration of the note.
+        rest_fraction: Rest fraction of the note.
+
+    Returns:
+        str: The formatted token.
+    """
+    key = (pitch, duration, rest_fraction)
+    token = _TOKEN_CACHE.get(key)
+    if token is None:
+        if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+            _TOKEN_CACHE.clear()
+        token = _TOKEN_CACHE[key] = "{%s,%s,%s}" % key
+    return token
+
+
+def _hash_ngrams(pitch, dur_bits, rf_bits, n, out):
+    """
+    Computes one 64-bit FNV-1a fingerprint per n-gram window in a single pass.
+
+    Args:
+        pitch (np.ndarray): uint64 array of MIDI pitches.
+        dur_bits (np.ndarray): uint64 bit patterns of the duration floats.
+        rf_bits (np.ndarray): uint64 bit patterns of the rest-fraction floats.
+        n (int): Window size.
+        out (np.ndarray): uint64 output array of length len(pitch) - n + 1.
+    """
+    mask = (1 << 64) - 1
+    for i in range(out.shape[0]):
+        h = _FNV_OFFSET
+        for j in range(n):
+            h = ((h ^ int(pitch[i + j])) * _FNV_PRIME) & mask
+            h = ((h ^ int(dur_bits[i + j])) * _FNV_PRIME) & mask
+            h = ((h ^ int(rf_bits[i + j])) * _FNV_PRIME) & mask
+        out[i] = h
+
+
+if _HAVE_NUMBA:
+    @njit(cache=True, parallel=True)
+    def _hash_ngrams(pitch, dur_bits, rf_bits, n, out):  # noqa: F811
+        prime = np.uint64(_FNV_PRIME)
+        for i in prange(out.shape[0]):
+            h = np.uint64(_FNV_OFFSET)
+            for j in range(n):
+                h = (h ^ pitch[i + j]) * prime
+                h = (h ^ dur_bits[i + j]) * prime
+                h = (h ^ rf_bits[i + j]) * prime
+            out[i] = h
+
 
 class NGram:
     """
     Represents a sequence of Note objects and provides methods for n-gram operations.
+
+    An NGram can be constructed either from an explicit list of Note objects
+    or, via get_ngrams, as a lightweight (melody, start, n) view into a
+    melody's backing arrays. Views avoid copying notes per window and let
+    equality checks run as vectorized array comparisons; the ``notes``
+    property materializes Note objects lazily when needed.
     """
 
+    # One NGram is allocated per window; __slots__ avoids carrying a
+    # __dict__ per instance.
+    __slots__ = ('_notes', '_melody', '_start', '_n',
+                 '_null_span', '_rhythm_key', '_cmp_key', '_str', '_hash')
+
     def __init__(self, notes: List[Note]):
         """
         Initializes an NGram object with a list of Note objects.
@@ -20,7 +106,78 @@ class NGram:
         Args:
             notes (List[Note]): A list of Note objects representing the n-gram.
         """
-        self.notes = notes
+        self._notes = notes
+        self._melody = None
+        self._start = 0
+        self._n = len(notes)
+        self._null_span = None
+        self._rhythm_key = None
+        self._cmp_key = None
+        self._str = None
+        self._hash = None
+
+    @classmethod
+    def _from_melody(cls, melody: Melody, start: int, n: int) -> 'NGram':
+        """
+        Creates an NGram as a view into a melody's backing arrays.
+
+        Args:
+            melody (Melody): The melody the n-gram is a window of.
+            start (int): Index of the first note of the window.
+            n (int): Number of notes in the window.
+
+        Returns:
+            NGram: A view-backed NGram; notes are materialized on demand.
+        """
+        ngram = cls.__new__(cls)
+        ngram._notes = None
+        ngram._melody = melody
+        ngram._start = start
+        ngram._n = n
+        ngram._null_span = None
+        ngram._rhythm_key = None
+        ngram._cmp_key = None
+        ngram._str = None
+        ngram._hash = None
+        return ngram
+
+    @property
+    def notes(self) -> List[Note]:
+        """
+        Returns the notes of the n-gram as a list of Note objects.
+
+        Returns:
+            List[Note]: The notes; materialized lazily for view-backed n-grams.
+        """
+        if self._notes is None:
+            self._notes = self._melody.notes[self._start:self._start + self._n]
+        return self._notes
+
+    def _arrays(self):
+        """
+        Returns the (pitch, duration, rest_fraction) array slices backing this
+        n-gram, or None if it was built from an explicit note list.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray] | None: Array views.
+        """
+        if self._melody is None:
+            return None
+        start, stop = self._start, self._start + self._n
+        return (self._melody.pitches[start:stop],
+                self._melody.durations[start:stop],
+                self._melody.rest_fractions[start:stop])
+
+    def __len__(self) -> int:
+        """
+        Returns the number of notes in the n-gram.
+
+        Returns:
+            int: The number of notes.
+        """
+        if self._notes is not None:
+            return len(self._notes)
+        return self._n
 
     def get_null_span(self) -> 'NGram':
         """
@@ -28,49 +185,111 @@ class NGram:
         This preserves the onset, duration, and rest fraction of each note while
         normalizing the pitch to create a rhythmic pattern.
 
+        The null span is fully determined by the n-gram's rhythm axis plus
+        its first pitch, so the result is computed once per NGram and
+        memoized.
+
         Returns:
             NGram: A new NGram where all notes have the same pitch as the first note.
         """
-        if not self.notes:
-            return NGram([])
+        if self._null_span is not None:
+            return self._null_span
 
-        first_pitch = self.notes[0].pitch
-        null_notes = []
+        if len(self) == 0:
+            self._null_span = NGram([])
+            return self._null_span
+
+        arrays = self._arrays()
+        if arrays is not None:
+            # Build the null span straight from the backing arrays: a
+            # broadcast pitch fill plus three slice copies into a private
+            # melody, so no Note objects are created.
+            pitch, duration, rest_fraction = arrays
+            start, stop = self._start, self._start + self._n
+            null_melody = Melody(self._melody.id)
+            null_melody.add_notes_bulk(
+                np.full(self._n, pitch[0], dtype=np.int16),
+                self._melody.onsets[start:stop],
+                duration,
+                rest_fraction
+            )
+            self._null_span = NGram._from_melody(null_melody, 0, self._n)
+            return self._null_span
 
-        for note in self.notes:
-            null_note = Note(
+        first_pitch = self.notes[0].pitch
+        null_notes = [
+            Note(
                 pitch=first_pitch,
                 onset=note.onset,
                 duration=note.duration,
                 rest_fraction=note.rest_fraction
             )
-            null_notes.append(null_note)
+            for note in self.notes
+        ]
+
+        self._null_span = NGram(null_notes)
+        return self._null_span
+
+    def rhythm_key(self) -> tuple:
+        """
+        Returns a compact hashable key for the n-gram's rhythmic identity.
 
-        return NGram(null_notes)
+        The key consists of the first pitch plus the duration and
+        rest-fraction sequences, i.e. exactly what get_null_span preserves:
+        two n-grams share a null span if and only if their rhythm keys are
+        equal. View-backed n-grams pack their array slices as bytes, so
+        computing the key allocates no per-note objects. The key is
+        memoized.
+
+        Returns:
+            tuple: (first_pitch, durations, rest_fractions) in hashable form.
+        """
+        if self._rhythm_key is None:
+            arrays = self._arrays()
+            if arrays is not None and len(self) > 0:
+                pitch, duration, rest_fraction = arrays
+                self._rhythm_key = (int(pitch[0]), duration.tobytes(), rest_fraction.tobytes())
+            elif self.notes:
+                durations = np.array([note.duration for note in self.notes], dtype=np.float64)
+                rest_fractions = np.array([note.rest_fraction for note in self.notes], dtype=np.float64)
+                self._rhythm_key = (int(self.notes[0].pitch), durations.tobytes(), rest_fractions.tobytes())
+            else:
+                self._rhythm_key = (None, b'', b'')
+        return self._rhythm_key
 
     def __str__(self) -> str:
         """
         Returns a string representation of the n-gram in the format
         {pitch,duration,rest_fraction} for each note.
 
+        View-backed n-grams join a slice of the melody's precomputed token
+        list, so overlapping windows never re-format a note; list-backed
+        n-grams go through the shared token cache. The joined result is
+        also memoized on the instance (n-grams are immutable once built).
+
         Returns:
             str: String representation of the n-gram.
         """
-        if not self.notes:
-            return ""
-
-        note_strings = []
-        for note in self.notes:
-            note_str = f"{{{note.pitch},{note.duration},{note.rest_fraction}}}"
-            note_strings.append(note_str)
-
-        return "".join(note_strings)
+        if self._str is None:
+            if self._melody is not None:
+                self._str = ''.join(
+                    self._melody.tokens[self._start:self._start + self._n]
+                )
+            else:
+                self._str = ''.join(
+                    _format_token(note.pitch, note.duration, note.rest_fraction)
+                    for note in self._notes
+                )
+        return self._str
 
     @staticmethod
     def get_ngrams(melody: Melody, n: int) -> List['NGram']:
         """
         Generates a list of n-grams from a melody.
 
+        Each n-gram is a view into the melody's backing arrays, so no notes
+        are copied per window.
+
         Args:
             melody (Melody): The melody object to generate n-grams from.
             n (int): The size of each n-gram (number of notes).
@@ -79,23 +298,135 @@ class NGram:
             List[NGram]: A list of NGram objects representing all possible n-grams
                         from the melody.
         """
-        if n <= 0:
+        # Single entry guard: invalid n and too-short melodies bail out
+        # before any window construction. len(melody) reads the stored
+        # note count, so no notes are materialized either way.
+        length = len(melody)
+        if n <= 0 or length < n:
             return []
 
-        if len(melody.notes) < n:
-            return []
+        return [NGram._from_melody(melody, i, n) for i in range(length - n + 1)]
+
+    @staticmethod
+    def windows(melody: Melody, n: int):
+        """
+        Returns zero-copy sliding-window views over a melody's arrays.
+
+        Each returned array has shape (len(melody) - n + 1, n); row i holds
+        the values of the n-gram starting at note i. No data is copied:
+        the rows are strided views into the melody's backing arrays, so
+        bulk numeric consumers can process every n-gram without creating
+        NGram objects at all.
+
+        Args:
+            melody (Melody): The melody to window.
+            n (int): The size of each n-gram (number of notes).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Sliding-window views
+                of (pitches, durations, rest_fractions); empty (0, n)-shaped
+                arrays when n is invalid or the melody is too short.
+        """
+        if n <= 0 or len(melody) < n:
+            empty = np.empty((0, max(n, 0)))
+            return (empty.astype(np.int16), empty, empty.copy())
+        return (np.lib.stride_tricks.sliding_window_view(melody.pitches, n),
+                np.lib.stride_tricks.sliding_window_view(melody.durations, n),
+                np.lib.stride_tricks.sliding_window_view(melody.rest_fractions, n))
+
+    @staticmethod
+    def hash_all(melody: Melody, n: int) -> np.ndarray:
+        """
+        Computes a 64-bit fingerprint for every n-gram of a melody in one pass.
+
+        Fingerprints cover the same fields as NGram equality (pitch, duration,
+        rest fraction), so n-grams with different fingerprints are guaranteed
+        unequal. This enables hash-based grouping of n-grams instead of
+        O(N^2) pairwise comparison. The kernel is JIT-compiled with numba
+        when it is installed.
+
+        Args:
+            melody (Melody): The melody to fingerprint.
+            n (int): The size of each n-gram (number of notes).
+
+        Returns:
+            np.ndarray: uint64 array with one fingerprint per n-gram, in the
+                same order as get_ngrams(melody, n).
+        """
+        length = len(melody)
+        if n <= 0 or length < n:
+            return np.empty(0, dtype=np.uint64)
+
+        pitch = melody.pitches.astype(np.uint64)
+        dur_bits = np.ascontiguousarray(melody.durations).view(np.uint64)
+        rf_bits = np.ascontiguousarray(melody.rest_fractions).view(np.uint64)
+        out = np.empty(length - n + 1, dtype=np.uint64)
+        _hash_ngrams(pitch, dur_bits, rf_bits, n, out)
+        return out
+
+    def _first_pitch(self) -> int:
+        """
+        Returns the pitch of the first note without materializing notes.
+
+        Returns:
+            int: MIDI pitch of the first note.
+        """
+        if self._melody is not None:
+            return int(self._melody.pitches[self._start])
+        return self._notes[0].pitch
+
+    def _key(self) -> tuple:
+        """
+        Returns the cached comparison key covering the fields NGram equality
+        is defined over: the pitch, duration, and rest-fraction sequences.
+
+        Returns:
+            tuple: (pitches, durations, rest_fractions) as tuples of Python
+                scalars.
+        """
+        if self._cmp_key is None:
+            arrays = self._arrays()
+            if arrays is not None:
+                pitch, duration, rest_fraction = arrays
+                self._cmp_key = (tuple(pitch.tolist()),
+                                 tuple(duration.tolist()),
+                                 tuple(rest_fraction.tolist()))
+            else:
+                self._cmp_key = (tuple(note.pitch for note in self._notes),
+                                 tuple(note.duration for note in self._notes),
+                                 tuple(note.rest_fraction for note in self._notes))
+        return self._cmp_key
+
+    @staticmethod
+    def group(ngrams) -> Dict['NGram', List[int]]:
+        """
+        Groups equal n-grams by hashing instead of pairwise comparison.
 
-        ngrams = []
-        for i in range(len(melody.notes) - n + 1):
-            ngram_notes = melody.notes[i:i + n]
-            ngrams.append(NGram(ngram_notes))
+        Clustering N n-grams this way costs O(N) hash insertions rather
+        than the O(N^2) element-wise __eq__ calls of an all-pairs scan.
 
-        return ngrams
+        Args:
+            ngrams (Iterable[NGram]): The n-grams to cluster.
+
+        Returns:
+            Dict[NGram, List[int]]: Maps one representative of each
+                equality class to the indices of all equal n-grams, in
+                input order.
+        """
+        groups = defaultdict(list)
+        for i, ngram in enumerate(ngrams):
+            groups[ngram].append(i)
+        return dict(groups)
 
     def __eq__(self, other) -> bool:
         """
         Checks equality between two NGram objects.
 
+        Two n-grams are equal when their pitch, duration, and rest-fraction
+        sequences match; onsets are ignored. View-backed n-grams compare
+        their array slices directly; otherwise the cached comparison keys
+        are compared as a single C-level tuple comparison.
+
         Args:
             other (NGram): Another NGram object to compare with.
 
@@ -105,17 +436,59 @@ class NGram:
         if not isinstance(other, NGram):
             return False
 
-        if len(self.notes) != len(other.notes):
+        if len(self) != len(other):
+            return False
+
+        if len(self) == 0:
+            return True
+
+        # Cheap reject: in a large corpus most candidate pairs differ in
+        # their first pitch, so bail out before any per-note comparison.
+        if self._first_pitch() != other._first_pitch():
+            return False
+
+        # If both sides already paid for their hash (e.g. during dict
+        # grouping), one integer compare rejects the mismatch outright.
+        if (self._hash is not None and other._hash is not None
+                and self._hash != other._hash):
             return False
 
-        for i, note in enumerate(self.notes):
-            other_note = other.notes[i]
-            if (note.pitch != other_note.pitch or
-                note.duration != other_note.duration or
-                note.rest_fraction != other_note.rest_fraction):
+        self_arrays = self._arrays()
+        other_arrays = other._arrays()
+        if self_arrays is not None and other_arrays is not None:
+            # One memcmp over the packed uint64 encoding rejects almost all
+            # mismatches; only packed-equal n-grams need the exact float
+            # comparison (quantization can collide).
+            if not np.array_equal(self._packed_slice(), other._packed_slice()):
                 return False
+            return all(np.array_equal(a, b) for a, b in zip(self_arrays, other_arrays))
+
+        return self._key() == other._key()
+
+    def _packed_slice(self) -> np.ndarray:
+        """
+        Returns this n-gram's window of the melody's packed uint64 notes.
+
+        Returns:
+            np.ndarray: uint64 view of the n-gram's packed notes.
+        """
+        return self._melody.packed[self._start:self._start + self._n]
+
+    def __hash__(self) -> int:
+        """
+        Returns a hash consistent with NGram equality, making NGram usable
+        as a dict or set key for O(N) deduplication.
 
-        return True
+        The value is memoized: dict probing hashes the same key once per
+        insertion plus once per collision, so repeated lookups reduce to
+        returning a stored integer.
+
+        Returns:
+            int: Hash of the comparison key.
+        """
+        if self._hash is None:
+            self._hash = hash(self._key())
+        return self._hash
 
     def __repr__(self) -> str:
         """
@@ -0,0 +1,63 @@
+"""
+Numeric kernels used while assembling melodies.
+
+When numba is installed the kernels are JIT-compiled (with on-disk
+compilation caching, so worker processes reuse the compiled code);
+otherwise equivalent vectorized numpy implementations are used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:  # numba is an optional speed dependency
+    _HAVE_NUMBA = False
+
+
+def compute_rest_fractions(onsets, ends):
+    """
+    Computes per-note rest fractions with the Java MelodyShape formula.
+
+    For each note after the first,
+    rest = (onset - last_off) / (end - last_off), where last_off is the
+    end time of the previous note; the first note and degenerate spans
+    get 0.0.
+
+    Args:
+        onsets (np.ndarray): Onset times in quarter notes (float64),
+            sorted ascending.
+        ends (np.ndarray): End times in quarter notes (float64).
+
+    Returns:
+        np.ndarray: float64 array of rest fractions.
+    """
+    n = onsets.shape[0]
+    rest = np.zeros(n)
+    if n == 0:
+        return rest
+    last_off = np.empty_like(ends)
+    last_off[0] = 0.0
+    last_off[1:] = ends[:-1]
+    span = ends - last_off
+    gap = onsets - last_off
+    np.divide(gap, span, out=rest, where=span > 0)
+    rest[0] = 0.0
+    return rest
+
+
+if _HAVE_NUMBA:
+    # Same recurrence as the numpy version above, compiled to a single
+    # allocation-free scalar loop. fastmath is deliberately off so the
+    # results stay bit-identical to the numpy path.
+    @njit(cache=True)
+    def compute_rest_fractions(onsets, ends):  # noqa: F811
+        n = onsets.shape[0]
+        out = np.zeros(n)
+        last_off = 0.0
+        for i in range(n):
+            span = ends[i] - last_off
+            if i > 0 and span > 0:
+                out[i] = (onsets[i] - last_off) / span
+            last_off = ends[i]
+        return out
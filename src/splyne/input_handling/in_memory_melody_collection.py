@@ -2,16 +2,55 @@
 In-memory implementation of MelodyCollection that reads MIDI files from directories or ZIP files.
 """
 
+import hashlib
 import os
+import pickle
+import threading
 import zipfile
-import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Iterator, Dict, Union
 import logging
 
 from .melody_collection import MelodyCollection
 from .melody import Melody
-from .tunes_reader import MidiReader
+from .tunes_reader import MidiReader, _cache_dir, _CACHE_VERSION
+
+# Sentinel distinguishing "absent" from stored values in dict.pop calls.
+_MISSING = object()
+
+# Minimum number of files before parsing is dispatched to a process pool;
+# below this the pool start-up cost outweighs the parallel speedup.
+_PARALLEL_THRESHOLD = 16
+
+# Reader reused across every file a worker process handles.
+_WORKER_READER = None
+
+
+def _parse_midi_file(path: str, melody_id: str):
+    """
+    Parses one MIDI file in a worker process.
+
+    Module-level so it is picklable by ProcessPoolExecutor. Errors are
+    returned rather than raised so one bad file does not abort the batch.
+    The MidiReader (and its backend resolution) is created once per
+    worker process and reused for every file.
+
+    Args:
+        path (str): Path to the MIDI file.
+        melody_id (str): Unique identifier for the melody.
+
+    Returns:
+        tuple[str, Melody | None, Exception | None]: The melody ID, the
+            parsed melody (or None on failure), and the error if any.
+    """
+    global _WORKER_READER
+    if _WORKER_READER is None:
+        _WORKER_READER = MidiReader()
+    try:
+        return melody_id, _WORKER_READER.read(melody_id, path), None
+    except Exception as e:
+        return melody_id, None, e
 
 
 class InMemoryMelodyCollection(MelodyCollection):
@@ -20,13 +59,23 @@ class InMemoryMelodyCollection(MelodyCollection):
     parses them, and stores them in memory.
     """
 
-    def __init__(self, path: Union[str, Path], name: str = None):
+    def __init__(self, path: Union[str, Path], name: str = None, use_cache: bool = True,
+                 preload: bool = True):
         """
         Initializes the InMemoryMelodyCollection by reading MIDI files from the given path.
 
         Args:
             path (Union[str, Path]): Path to a directory containing MIDI files or a ZIP file.
             name (str, optional): Name of the collection. If not provided, uses the basename of the path.
+            use_cache (bool): Whether to pickle the loaded collection to the
+                splyne cache directory so unchanged sources skip the parser
+                on the next load.
+            preload (bool): Whether to parse every file up front. With
+                False only the sources are enumerated, and each melody is
+                parsed on its first get(); fetching one melody from a huge
+                corpus then skips every other parse. A source that fails
+                to parse is dropped on first access and get() raises
+                KeyError, mirroring eager loading's log-and-skip.
 
         Raises:
             FileNotFoundError: If the specified path does not exist.
@@ -36,14 +85,26 @@ class InMemoryMelodyCollection(MelodyCollection):
         self._name = name or self._path.stem
         self._melodies: Dict[str, Melody] = {}
         self._midi_reader = MidiReader()
+        self._use_cache = use_cache
+        # Cached tuple of melody IDs, rebuilt lazily after any mutation.
+        self._ids_cache = None
+        # Melodies already parsed during this load, keyed by content
+        # digest, so duplicate files are cloned instead of re-parsed.
+        self._content_cache = {}
+        # Sources not parsed yet (lazy mode): melody ID -> file Path for
+        # directories, or ZIP member name for archives.
+        self._lazy_sources = {}
         
         # Set up logging
         self._logger = logging.getLogger(__name__)
         
         if not self._path.exists():
             raise FileNotFoundError(f"Path does not exist: {path}")
-        
-        self._load_melodies()
+
+        if preload:
+            self._load_melodies()
+        else:
+            self._discover_sources()
 
     def _load_melodies(self) -> None:
         """
@@ -56,30 +117,216 @@ class InMemoryMelodyCollection(MelodyCollection):
         else:
             raise ValueError(f"Path must be a directory or ZIP file: {self._path}")
 
+    def _discover_sources(self) -> None:
+        """
+        Enumerates melody sources without parsing them (lazy mode).
+
+        Raises:
+            ValueError: If the path is neither a directory nor a ZIP file,
+                or the archive is invalid.
+        """
+        if self._path.is_dir():
+            for file_path in sorted(self._iter_midi_files(self._path)):
+                self._lazy_sources[file_path.stem] = file_path
+        elif self._path.is_file() and self._path.suffix.lower() == '.zip':
+            self._check_zip_magic()
+            try:
+                with zipfile.ZipFile(self._path, 'r') as zip_file:
+                    for member in zip_file.namelist():
+                        if not member.endswith('/') and self._midi_reader.accept(member):
+                            self._lazy_sources[Path(member).stem] = member
+            except zipfile.BadZipFile:
+                raise ValueError(f"Invalid ZIP file: {self._path}")
+        else:
+            raise ValueError(f"Path must be a directory or ZIP file: {self._path}")
+        self._logger.info("Discovered %d melody sources: %s", len(self._lazy_sources), self._path)
+
+    def _load_lazy(self, melody_id: str) -> Melody:
+        """
+        Parses one lazily discovered source on its first access.
+
+        Failures mirror eager loading's log-and-skip: a source that
+        cannot be parsed is logged, dropped from the collection, and
+        reported as absent via KeyError — the same exception callers
+        already handle for an unknown ID.
+
+        Args:
+            melody_id (str): Unique identifier of the melody.
+
+        Returns:
+            Melody: The parsed melody.
+
+        Raises:
+            KeyError: If the source cannot be read or parsed.
+        """
+        source = self._lazy_sources.pop(melody_id)
+        self._ids_cache = None
+        try:
+            if isinstance(source, Path):
+                melody = self._melody_from_bytes(melody_id, source.read_bytes())
+            else:
+                with zipfile.ZipFile(self._path, 'r') as zip_file:
+                    melody = self._melody_from_bytes(melody_id, zip_file.read(source))
+        except Exception as e:
+            self._logger.error("Failed to read and parse %s: %s", source, e)
+            raise KeyError(f"No melody found with ID: {melody_id}") from e
+        self._melodies[melody_id] = melody
+        return melody
+
     def _load_from_directory(self) -> None:
         """
         Loads all MIDI files from a directory.
         """
-        midi_files = []
-        
         # Find all MIDI files in the directory (including subdirectories)
-        for file_path in self._path.rglob("*"):
-            if file_path.is_file() and self._midi_reader.accept(file_path.name):
-                midi_files.append(file_path)
-        
+        midi_files = sorted(self._iter_midi_files(self._path))
+
         if not midi_files:
-            self._logger.warning(f"No MIDI files found in directory: {self._path}")
+            self._logger.warning("No MIDI files found in directory: %s", self._path)
             return
         
-        self._logger.info(f"Found {len(midi_files)} MIDI files in directory: {self._path}")
-        
-        for file_path in midi_files:
-            self._load_midi_file(file_path, file_path.stem)
+        self._logger.info("Found %d MIDI files in directory: %s", len(midi_files), self._path)
+
+        if self._use_cache:
+            manifest = [(str(p), os.path.getmtime(p)) for p in midi_files]
+            if self._load_pickle_cache(manifest):
+                return
+
+        # Build the hash table at its final size up front; the per-file
+        # inserts below then overwrite values without ever rehashing.
+        self._melodies = dict.fromkeys((p.stem for p in midi_files), None)
+
+        if len(midi_files) > _PARALLEL_THRESHOLD:
+            self._load_files_parallel(midi_files)
+        else:
+            self._load_files_prefetched(midi_files)
+
+        self._prune_failed_entries()
+
+        if self._use_cache:
+            self._store_pickle_cache(manifest)
+
+    def _iter_midi_files(self, root) -> Iterator[Path]:
+        """
+        Recursively yields the MIDI file paths under a directory.
+
+        Walks with os.scandir so file-versus-directory checks reuse the
+        type information already returned by the directory read instead
+        of issuing one stat call per entry, and runs the extension check
+        on the entry name before any Path object is allocated.
+
+        Args:
+            root (Path | str): Directory to walk.
+
+        Yields:
+            Path: Path of each accepted MIDI file.
+        """
+        for entry in os.scandir(root):
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._iter_midi_files(entry.path)
+            elif entry.is_file(follow_symlinks=False) and self._midi_reader.accept(entry.name):
+                yield Path(entry.path)
+
+    def _melody_from_bytes(self, melody_id: str, data: bytes) -> Melody:
+        """
+        Parses MIDI bytes, deduplicating identical content within this load.
+
+        Corpora often contain byte-identical copies of a tune under
+        different names; hashing the bytes costs microseconds next to a
+        parse, so duplicates are answered with a copy of the original's
+        note arrays under the new ID.
+
+        Args:
+            melody_id (str): Unique identifier for the melody.
+            data (bytes): Raw bytes of a MIDI file.
+
+        Returns:
+            Melody: The parsed (or cloned) melody.
+        """
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        cached = self._content_cache.get(digest)
+        if cached is not None:
+            return cached.clone(melody_id)
+        melody = self._midi_reader.read_bytes(melody_id, data)
+        self._content_cache[digest] = melody
+        return melody
+
+    def _load_files_prefetched(self, midi_files) -> None:
+        """
+        Parses MIDI files on the main thread while a small reader pool
+        prefetches file bytes in the background.
+
+        Used for batches too small to justify a process pool: the next
+        files' reads overlap with the current parse, hiding I/O latency
+        behind CPU work. The batch size is bounded by the parallel
+        threshold, so holding all blobs in flight stays cheap.
+
+        Args:
+            midi_files (list[Path]): Paths of the MIDI files to parse.
+        """
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(file_path.read_bytes) for file_path in midi_files]
+            for file_path, future in zip(midi_files, futures):
+                melody_id = file_path.stem
+                try:
+                    self._melodies[melody_id] = self._melody_from_bytes(
+                        melody_id, future.result()
+                    )
+                    self._ids_cache = None
+                    self._logger.debug("Successfully loaded melody: %s", melody_id)
+                except Exception as e:
+                    self._logger.error("Failed to parse MIDI file %s: %s", file_path, e)
+                    # Continue with other files rather than failing completely
+
+    def _load_files_parallel(self, midi_files) -> None:
+        """
+        Parses MIDI files across a process pool and collects the results
+        into the collection on the main thread.
+
+        Args:
+            midi_files (list[Path]): Paths of the MIDI files to parse.
+        """
+        workers = os.cpu_count() or 1
+        # Keep at most two submitted files per worker in flight: enough
+        # that the pool never idles while results are being stored, small
+        # enough that one oversized file cannot stall a whole map() batch.
+        window = 2 * workers
+        inflight = set()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for file_path in midi_files:
+                if len(inflight) >= window:
+                    done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                    self._collect_parse_results(done)
+                inflight.add(executor.submit(_parse_midi_file, str(file_path), file_path.stem))
+            while inflight:
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                self._collect_parse_results(done)
+
+    def _collect_parse_results(self, done) -> None:
+        """
+        Drains completed parse futures into the collection.
+
+        Args:
+            done (set[Future]): Completed futures from the parse pool.
+        """
+        for future in done:
+            melody_id, melody, error = future.result()
+            if melody is not None:
+                self._melodies[melody_id] = melody
+                self._ids_cache = None
+                self._logger.debug("Successfully loaded melody: %s", melody_id)
+            else:
+                self._logger.error("Failed to parse MIDI file %s: %s", melody_id, error)
 
     def _load_from_zip(self) -> None:
         """
         Loads all MIDI files from a ZIP archive.
         """
+        self._check_zip_magic()
+
+        manifest = [(str(self._path), os.path.getmtime(self._path))]
+        if self._use_cache and self._load_pickle_cache(manifest):
+            return
+
         try:
             with zipfile.ZipFile(self._path, 'r') as zip_file:
                 midi_files = [
@@ -88,33 +335,190 @@ class InMemoryMelodyCollection(MelodyCollection):
                 ]
                 
                 if not midi_files:
-                    self._logger.warning(f"No MIDI files found in ZIP archive: {self._path}")
+                    self._logger.warning("No MIDI files found in ZIP archive: %s", self._path)
                     return
                 
-                self._logger.info(f"Found {len(midi_files)} MIDI files in ZIP archive: {self._path}")
-                
-                # Create a temporary directory to extract files
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    for midi_file in midi_files:
-                        try:
-                            # Extract the file to temporary directory
-                            zip_file.extract(midi_file, temp_dir)
-                            extracted_path = Path(temp_dir) / midi_file
-                            
-                            # Use the filename without extension as melody ID
-                            melody_id = Path(midi_file).stem
-                            
-                            self._load_midi_file(extracted_path, melody_id)
-                            
-                        except Exception as e:
-                            self._logger.error(f"Failed to extract and parse {midi_file}: {e}")
-                            continue
-                            
+                self._logger.info("Found %d MIDI files in ZIP archive: %s", len(midi_files), self._path)
+
+                # Build the hash table at its final size up front; the
+                # per-member inserts below never rehash.
+                self._melodies = dict.fromkeys(
+                    (Path(name).stem for name in midi_files), None
+                )
+
+                # Stream each member's bytes straight into the reader; no
+                # temporary files, and large archives decompress their
+                # members across a thread pool (zlib releases the GIL).
+                if len(midi_files) > _PARALLEL_THRESHOLD:
+                    members = self._read_zip_members_parallel(midi_files)
+                else:
+                    members = None
+
+                for index, midi_file in enumerate(midi_files):
+                    try:
+                        data = members[index] if members is not None else zip_file.read(midi_file)
+                        if isinstance(data, Exception):
+                            raise data
+
+                        # Use the filename without extension as melody ID
+                        melody_id = Path(midi_file).stem
+
+                        self._melodies[melody_id] = self._melody_from_bytes(melody_id, data)
+                        self._ids_cache = None
+                        self._logger.debug("Successfully loaded melody: %s", melody_id)
+
+                    except Exception as e:
+                        self._logger.error("Failed to read and parse %s: %s", midi_file, e)
+                        continue
+
+                self._prune_failed_entries()
+
         except zipfile.BadZipFile:
             raise ValueError(f"Invalid ZIP file: {self._path}")
         except Exception as e:
             raise RuntimeError(f"Failed to read ZIP file {self._path}: {e}")
 
+        if self._use_cache:
+            self._store_pickle_cache(manifest)
+
+    def _check_zip_magic(self) -> None:
+        """
+        Rejects files that cannot be ZIP archives.
+
+        A four-byte header read accepts the common case without touching
+        the rest of the file. Files without a leading ZIP signature are
+        not rejected outright — archives with prepended data (e.g.
+        self-extracting ZIPs) are valid — but fall back to zipfile's own
+        end-of-central-directory scan, so only genuinely non-ZIP files
+        pay the worst-case tail scan.
+
+        Raises:
+            ValueError: If the file is not a ZIP archive.
+        """
+        with open(self._path, 'rb') as f:
+            signature = f.read(4)
+        # Local file header, end-of-central-directory for empty archives,
+        # or the spanned-archive marker.
+        if signature in (b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08'):
+            return
+        if not zipfile.is_zipfile(self._path):
+            raise ValueError(f"Invalid ZIP file: {self._path}")
+
+    def _prune_failed_entries(self) -> None:
+        """
+        Drops presized placeholder entries whose parse never succeeded.
+        """
+        failed = [melody_id for melody_id, melody in self._melodies.items() if melody is None]
+        for melody_id in failed:
+            del self._melodies[melody_id]
+        self._ids_cache = None
+
+    def _pickle_cache_path(self) -> Path:
+        """
+        Returns the cache file path for this collection's source path.
+
+        The cache schema version in the name retires entries written by
+        older parser code.
+
+        Returns:
+            Path: Path of the pickled collection cache entry.
+        """
+        digest = hashlib.blake2b(
+            str(self._path.resolve()).encode('utf-8'), digest_size=16
+        ).hexdigest()
+        return _cache_dir() / f"collection-{digest}-v{_CACHE_VERSION}.pkl"
+
+    def _load_pickle_cache(self, manifest: list) -> bool:
+        """
+        Loads the whole collection from its pickle cache, if still fresh.
+
+        The cache stores the source manifest — the sorted (path, mtime)
+        pairs it was built from — and is fresh only when the current
+        manifest matches it exactly, so edited, added and removed source
+        files all force a re-parse (an mtime-only comparison misses
+        deletions and files copied in with older timestamps).
+
+        Args:
+            manifest (list[tuple[str, float]]): Current source manifest.
+
+        Returns:
+            bool: True if the collection was populated from the cache.
+        """
+        cache_path = self._pickle_cache_path()
+        try:
+            with open(cache_path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return False
+        if not isinstance(payload, dict) or payload.get('manifest') != manifest:
+            return False
+        melodies = payload.get('melodies')
+        if not isinstance(melodies, dict):
+            return False
+        self._melodies = melodies
+        self._ids_cache = None
+        self._logger.info("Loaded %d melodies from cache: %s", len(melodies), cache_path)
+        return True
+
+    def _store_pickle_cache(self, manifest: list) -> None:
+        """
+        Writes the loaded collection and its source manifest to the pickle
+        cache atomically.
+
+        Args:
+            manifest (list[tuple[str, float]]): Source manifest the
+                collection was built from.
+        """
+        cache_path = self._pickle_cache_path()
+        tmp_path = cache_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'manifest': manifest, 'melodies': self._melodies}, f, protocol=5)
+            tmp_path.replace(cache_path)
+        except OSError:
+            # Caching is best-effort; a read-only cache directory is not an error.
+            if tmp_path.exists():
+                tmp_path.unlink(missing_ok=True)
+
+    def _read_zip_members_parallel(self, midi_files) -> list:
+        """
+        Decompresses ZIP members across a thread pool.
+
+        zlib releases the GIL inside inflate, so member decompression
+        overlaps across cores. A ZipFile handle is not safe to share
+        between threads, so each worker opens its own handle on the
+        archive; re-parsing the central directory per thread is cheap
+        next to the inflate work gained.
+
+        Args:
+            midi_files (list[str]): Member names to read.
+
+        Returns:
+            list[bytes | Exception]: Member bytes in input order, or the
+                error raised while reading that member.
+        """
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+
+        def read_member(name):
+            handle = getattr(local, 'zip_file', None)
+            if handle is None:
+                handle = local.zip_file = zipfile.ZipFile(self._path, 'r')
+                with handles_lock:
+                    handles.append(handle)
+            try:
+                return handle.read(name)
+            except Exception as e:
+                return e
+
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                return list(executor.map(read_member, midi_files))
+        finally:
+            for handle in handles:
+                handle.close()
+
     def _load_midi_file(self, file_path: Path, melody_id: str) -> None:
         """
         Loads a single MIDI file and adds it to the collection.
@@ -124,12 +528,13 @@ class InMemoryMelodyCollection(MelodyCollection):
             melody_id (str): Unique identifier for the melody.
         """
         try:
-            melody = self._midi_reader.read(melody_id, str(file_path))
+            melody = self._melody_from_bytes(melody_id, Path(file_path).read_bytes())
             self._melodies[melody_id] = melody
-            self._logger.debug(f"Successfully loaded melody: {melody_id}")
+            self._ids_cache = None
+            self._logger.debug("Successfully loaded melody: %s", melody_id)
             
         except Exception as e:
-            self._logger.error(f"Failed to parse MIDI file {file_path}: {e}")
+            self._logger.error("Failed to parse MIDI file %s: %s", file_path, e)
             # Continue with other files rather than failing completely
 
     def get_name(self) -> str:
@@ -141,6 +546,31 @@ class InMemoryMelodyCollection(MelodyCollection):
         """
         return self._name
 
+    def snapshot(self) -> 'InMemoryMelodyCollection':
+        """
+        Returns an independent copy of this collection without re-parsing.
+
+        Only the ID dictionaries are copied; the Melody objects themselves
+        are shared, which is safe because melodies are not mutated after
+        loading. Adding, removing or clearing on either collection leaves
+        the other untouched, so a snapshot is a cheap per-test (or
+        per-experiment) working copy of an expensively parsed corpus.
+
+        Returns:
+            InMemoryMelodyCollection: A new collection over the same melodies.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone._path = self._path
+        clone._name = self._name
+        clone._melodies = dict(self._melodies)
+        clone._midi_reader = self._midi_reader
+        clone._use_cache = self._use_cache
+        clone._ids_cache = None
+        clone._content_cache = {}
+        clone._lazy_sources = dict(self._lazy_sources)
+        clone._logger = self._logger
+        return clone
+
     def add(self, melody: Melody) -> None:
         """
         Adds a melody to the collection.
@@ -151,11 +581,12 @@ class InMemoryMelodyCollection(MelodyCollection):
         Raises:
             ValueError: If a melody with the same ID already exists.
         """
-        if melody.id in self._melodies:
+        if melody.id in self._melodies or melody.id in self._lazy_sources:
             raise ValueError(f"Melody with ID '{melody.id}' already exists in collection")
         
         self._melodies[melody.id] = melody
-        self._logger.debug(f"Added melody to collection: {melody.id}")
+        self._ids_cache = None
+        self._logger.debug("Added melody to collection: %s", melody.id)
 
     def get(self, melody_id: str) -> Melody:
         """
@@ -170,10 +601,12 @@ class InMemoryMelodyCollection(MelodyCollection):
         Raises:
             KeyError: If no melody with the given ID exists.
         """
-        if melody_id not in self._melodies:
-            raise KeyError(f"No melody found with ID: {melody_id}")
-        
-        return self._melodies[melody_id]
+        melody = self._melodies.get(melody_id)
+        if melody is not None:
+            return melody
+        if melody_id in self._lazy_sources:
+            return self._load_lazy(melody_id)
+        raise KeyError(f"No melody found with ID: {melody_id}")
 
     def size(self) -> int:
         """
@@ -182,16 +615,38 @@ class InMemoryMelodyCollection(MelodyCollection):
         Returns:
             int: The number of melodies in the collection.
         """
-        return len(self._melodies)
+        return len(self._melodies) + len(self._lazy_sources)
 
     def __iter__(self) -> Iterator[Melody]:
         """
         Allows iteration over the melodies in the collection.
 
         Returns:
-            Iterator[Melody]: An iterator over the melodies.
+            Iterator[Melody]: An iterator over the melodies. Lazily
+                discovered sources are parsed as the iteration reaches
+                them; sources that fail to parse are skipped, as they
+                would have been during an eager load.
+        """
+        for melody_id in self.ids():
+            try:
+                yield self.get(melody_id)
+            except KeyError:
+                continue
+
+    def ids(self) -> tuple:
+        """
+        Returns the melody IDs as a cached tuple.
+
+        The tuple is rebuilt lazily after mutations, so callers that
+        iterate IDs repeatedly (e.g. pairwise similarity loops) share one
+        allocation instead of materializing a fresh list per call.
+
+        Returns:
+            tuple[str, ...]: Tuple of melody IDs.
         """
-        return iter(self._melodies.values())
+        if self._ids_cache is None:
+            self._ids_cache = tuple(self._melodies) + tuple(self._lazy_sources)
+        return self._ids_cache
 
     def list_melody_ids(self) -> list[str]:
         """
@@ -200,7 +655,7 @@ class InMemoryMelodyCollection(MelodyCollection):
         Returns:
             list[str]: List of melody IDs.
         """
-        return list(self._melodies.keys())
+        return list(self.ids())
 
     def contains(self, melody_id: str) -> bool:
         """
@@ -212,7 +667,7 @@ class InMemoryMelodyCollection(MelodyCollection):
         Returns:
             bool: True if the melody exists, False otherwise.
         """
-        return melody_id in self._melodies
+        return melody_id in self._melodies or melody_id in self._lazy_sources
 
     def remove(self, melody_id: str) -> None:
         """
@@ -224,17 +679,19 @@ class InMemoryMelodyCollection(MelodyCollection):
         Raises:
             KeyError: If no melody with the given ID exists.
         """
-        if melody_id not in self._melodies:
+        if (self._melodies.pop(melody_id, _MISSING) is _MISSING
+                and self._lazy_sources.pop(melody_id, _MISSING) is _MISSING):
             raise KeyError(f"No melody found with ID: {melody_id}")
-        
-        del self._melodies[melody_id]
-        self._logger.debug(f"Removed melody from collection: {melody_id}")
+        self._ids_cache = None
+        self._logger.debug("Removed melody from collection: %s", melody_id)
 
     def clear(self) -> None:
         """
         Removes all melodies from the collection.
         """
         self._melodies.clear()
+        self._lazy_sources.clear()
+        self._ids_cache = None
         self._logger.debug("Cleared all melodies from collection")
 
     def __repr__(self) -> str:
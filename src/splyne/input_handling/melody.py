@@ -1,8 +1,69 @@
 """
 This class represents a musical melody, which is a sequence of notes.
+
+Notes are stored internally in a structure-of-arrays layout: four parallel
+numpy arrays (pitch, onset, duration, rest fraction) that grow geometrically
+as notes are appended. Bulk operations (n-gram generation, equality checks,
+reductions) can therefore run as vectorized C loops over contiguous buffers
+instead of Python attribute lookups over per-note objects. The ``notes``
+property still exposes the melody as a list of Note objects for callers
+that work note-by-note.
+
+Dtype policy: pitches are stored as int16 — MIDI pitch fits in 7 bits, but
+int16 leaves headroom for extended-pitch encodings while still cutting the
+bytes streamed per comparison by 4x versus boxed ints. Onset, duration and
+rest fraction stay float64 on purpose: melody equality and the n-gram
+string format must reproduce the Java MelodyShape reference values
+bit-for-bit, and tick ratios such as 1/96 round differently in float32.
 """
 
+import numpy as np
+
+from .note import Note
+
+_INITIAL_CAPACITY = 16
+
+# Quantization used by the packed uint64 note encoding: durations are
+# stored in 1/960-quarter ticks and rest fractions in 1/2^28 steps, each
+# masked to 28 bits, with the pitch in the top byte.
+_DURATION_QUANTA = 960
+_FIELD_BITS = 28
+_FIELD_MASK = np.uint64((1 << _FIELD_BITS) - 1)
+
+
+def _encode_packed(pitches, durations, rest_fractions):
+    """
+    Packs note fields into one uint64 per note: pitch<<56 |
+    duration_quanta<<28 | rest_quanta.
+
+    The encoding is a deterministic function of the float values, so two
+    packed arrays that differ are guaranteed to come from different note
+    sequences; equal packed arrays still require an exact float comparison
+    because quantization can collide.
+
+    Args:
+        pitches (np.ndarray): Integer MIDI pitches.
+        durations (np.ndarray): Durations in quarter notes.
+        rest_fractions (np.ndarray): Rest fractions in [0, 1].
+
+    Returns:
+        np.ndarray: uint64 array with one packed value per note.
+    """
+    duration_quanta = np.round(durations * _DURATION_QUANTA).astype(np.uint64) & _FIELD_MASK
+    rest_quanta = np.round(rest_fractions * (1 << _FIELD_BITS)).astype(np.uint64) & _FIELD_MASK
+    return ((pitches.astype(np.uint64) << np.uint64(2 * _FIELD_BITS)) |
+            (duration_quanta << np.uint64(_FIELD_BITS)) | rest_quanta)
+
+
 class Melody:
+    # Collections hold thousands of Melody instances; __slots__ drops the
+    # per-instance __dict__, like Note already does.
+    # __weakref__ lets the readers' weak content-interning table hold
+    # melodies without keeping them alive.
+    __slots__ = ('id', '_length', '_pitch', '_onset', '_duration',
+                 '_rest_fraction', '_notes_cache', '_packed_cache',
+                 '_tokens_cache', '__weakref__')
+
     def __init__(self, melody_id):
         """
         Initializes a Melody object.
@@ -11,7 +72,28 @@ class Melody:
             melody_id (str): Unique identifier for the melody.
         """
         self.id = melody_id
-        self.notes = []  # List to store Note objects
+        self._length = 0
+        self._pitch = np.empty(_INITIAL_CAPACITY, dtype=np.int16)
+        self._onset = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._duration = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._rest_fraction = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._notes_cache = None
+        self._packed_cache = None
+        self._tokens_cache = None
+
+    def _grow(self, minimum):
+        """
+        Grows the backing arrays geometrically to hold at least `minimum` notes.
+
+        Args:
+            minimum (int): Minimum required capacity.
+        """
+        capacity = max(minimum, 2 * len(self._pitch))
+        for name in ('_pitch', '_onset', '_duration', '_rest_fraction'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._length] = old[:self._length]
+            setattr(self, name, new)
 
     def add_note(self, note):
         """
@@ -20,7 +102,178 @@ class Melody:
         Args:
             note (Note): The Note object to add.
         """
-        self.notes.append(note)
+        if self._length == len(self._pitch):
+            self._grow(self._length + 1)
+        i = self._length
+        self._pitch[i] = note.pitch
+        self._onset[i] = note.onset
+        self._duration[i] = note.duration
+        self._rest_fraction[i] = note.rest_fraction
+        self._length = i + 1
+        self._notes_cache = None
+        self._packed_cache = None
+        self._tokens_cache = None
+
+    def add_notes_bulk(self, pitches, onsets, durations, rest_fractions):
+        """
+        Appends many notes at once from parallel arrays.
+
+        One capacity check and four slice assignments replace per-note
+        add_note calls, so readers that already hold the note fields as
+        arrays copy them straight into the backing buffers.
+
+        Args:
+            pitches (np.ndarray): Integer MIDI pitches.
+            onsets (np.ndarray): Onset times in quarter notes.
+            durations (np.ndarray): Durations in quarter notes.
+            rest_fractions (np.ndarray): Rest fractions in [0, 1].
+        """
+        count = len(pitches)
+        if count == 0:
+            return
+        needed = self._length + count
+        if needed > len(self._pitch):
+            self._grow(needed)
+        i = self._length
+        self._pitch[i:needed] = pitches
+        self._onset[i:needed] = onsets
+        self._duration[i:needed] = durations
+        self._rest_fraction[i:needed] = rest_fractions
+        self._length = needed
+        self._notes_cache = None
+        self._packed_cache = None
+        self._tokens_cache = None
+
+    def clone(self, melody_id):
+        """
+        Returns an independent copy of this melody under a new ID.
+
+        The logical note slices are copied into fresh backing arrays, so
+        appending to the clone and to the original never interfere (a
+        shallow copy would share spare capacity). Copying the arrays is
+        still orders of magnitude cheaper than re-parsing the source.
+
+        Args:
+            melody_id (str): Unique identifier for the copy.
+
+        Returns:
+            Melody: The copied melody.
+        """
+        duplicate = Melody(melody_id)
+        duplicate.add_notes_bulk(
+            self.pitches, self.onsets, self.durations, self.rest_fractions
+        )
+        return duplicate
+
+    @property
+    def pitches(self):
+        """
+        Returns the pitch sequence as a numpy array view.
+
+        Returns:
+            np.ndarray: int16 array of MIDI pitches.
+        """
+        return self._pitch[:self._length]
+
+    @property
+    def onsets(self):
+        """
+        Returns the onset sequence as a numpy array view.
+
+        Returns:
+            np.ndarray: float64 array of onset times.
+        """
+        return self._onset[:self._length]
+
+    @property
+    def durations(self):
+        """
+        Returns the duration sequence as a numpy array view.
+
+        Returns:
+            np.ndarray: float64 array of durations.
+        """
+        return self._duration[:self._length]
+
+    @property
+    def rest_fractions(self):
+        """
+        Returns the rest-fraction sequence as a numpy array view.
+
+        Returns:
+            np.ndarray: float64 array of rest fractions.
+        """
+        return self._rest_fraction[:self._length]
+
+    @property
+    def packed(self):
+        """
+        Returns the notes packed into one uint64 each, computed lazily and
+        cached until the melody is modified.
+
+        Returns:
+            np.ndarray: uint64 array; see _encode_packed for the layout.
+        """
+        if self._packed_cache is None:
+            self._packed_cache = _encode_packed(
+                self.pitches, self.durations, self.rest_fractions
+            )
+        return self._packed_cache
+
+    @property
+    def tokens(self):
+        """
+        Returns the notes rendered as "{pitch,duration,rest_fraction}"
+        tokens, computed lazily once per melody and cached until the
+        melody is modified.
+
+        The format matches the Java MelodyShape n-gram strings (str() on
+        a Python float round-trips like Java's Double.toString). N-gram
+        windows over a melody overlap heavily, so rendering the whole
+        melody once lets each window's string become a plain slice join.
+
+        Returns:
+            list[str]: One token per note.
+        """
+        if self._tokens_cache is None:
+            self._tokens_cache = [
+                "{%s,%s,%s}" % fields
+                for fields in zip(self.pitches.tolist(), self.durations.tolist(),
+                                  self.rest_fractions.tolist())
+            ]
+        return self._tokens_cache
+
+    @property
+    def notes(self):
+        """
+        Returns the notes as a list of Note objects.
+
+        The list is materialized lazily from the backing arrays and cached
+        until the melody is modified.
+
+        Returns:
+            list[Note]: The notes of the melody.
+        """
+        if self._notes_cache is None:
+            # tolist() converts each array to native Python scalars in one
+            # C call, instead of boxing one numpy scalar per field access.
+            self._notes_cache = [
+                Note(pitch=pitch, onset=onset, duration=duration, rest_fraction=rest_fraction)
+                for pitch, onset, duration, rest_fraction in zip(
+                    self.pitches.tolist(), self.onsets.tolist(),
+                    self.durations.tolist(), self.rest_fractions.tolist()
+                )
+            ]
+        return self._notes_cache
+
+    def __len__(self):
+        """
+        Returns the number of notes in the melody.
+
+        Returns:
+            int: The number of notes.
+        """
+        return self._length
 
     def get_id(self):
         """
@@ -3,6 +3,10 @@ This class represents a musical note with its pitch, duration, and onset time.
 """
 
 class Note:
+    # Notes are created once per MIDI event; __slots__ drops the
+    # per-instance __dict__ and speeds up attribute access in hot loops.
+    __slots__ = ('pitch', 'onset', 'duration', 'rest_fraction')
+
     def __init__(self, pitch, onset, duration, rest_fraction=0.0):
         """
         Initializes a Note object.
@@ -18,6 +22,35 @@ class Note:
         self.duration = duration
         self.rest_fraction = rest_fraction
 
+    def __eq__(self, other):
+        """
+        Checks equality between two Note objects by value.
+
+        Notes materialized from a melody's backing arrays compare equal to
+        the original Note objects they were built from.
+
+        Args:
+            other (Note): Another Note object to compare with.
+
+        Returns:
+            bool: True if all attributes are equal, False otherwise.
+        """
+        if not isinstance(other, Note):
+            return NotImplemented
+        return (self.pitch == other.pitch and
+                self.onset == other.onset and
+                self.duration == other.duration and
+                self.rest_fraction == other.rest_fraction)
+
+    def __hash__(self):
+        """
+        Returns a hash consistent with value equality.
+
+        Returns:
+            int: Hash of the note's attributes.
+        """
+        return hash((self.pitch, self.onset, self.duration, self.rest_fraction))
+
     def __repr__(self):
         """
         Returns a string representation of the note.
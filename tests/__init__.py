@@ -1 +1,16 @@
 """Unit test package for splyne."""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+# The readers and collections cache parses under XDG_CACHE_HOME by
+# default. Point it at a per-session temp directory before any test
+# touches splyne, so every run exercises the live parser at least once
+# (a warm user cache would otherwise keep the suite green on stale
+# entries after a parser regression) and no cache files are left behind
+# in the user's real cache directory.
+_cache_root = tempfile.mkdtemp(prefix='splyne-test-cache-')
+os.environ['XDG_CACHE_HOME'] = _cache_root
+atexit.register(shutil.rmtree, _cache_root, ignore_errors=True)
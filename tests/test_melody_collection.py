@@ -3,6 +3,7 @@ Test cases for MelodyCollection and InMemoryMelodyCollection classes.
 """
 
 import os
+import shutil
 import tempfile
 import zipfile
 import unittest
@@ -28,16 +29,32 @@ class TestMelodyCollection(unittest.TestCase):
 class TestInMemoryMelodyCollection(unittest.TestCase):
     """Test cases for InMemoryMelodyCollection class."""
 
-    def setUp(self):
-        """Set up test data directory."""
-        self.test_data_dir = os.path.join(os.path.dirname(__file__), 'test_data')
-        self.midi_dir = os.path.join(self.test_data_dir, 'midi')
+    @classmethod
+    def setUpClass(cls):
+        """Parse the test corpus once; individual tests work on snapshots."""
+        cls.test_data_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        cls.midi_dir = os.path.join(cls.test_data_dir, 'midi')
 
         # Ensure the test data directory exists
-        self.assertTrue(os.path.exists(self.test_data_dir),
-                       f"Test data directory not found: {self.test_data_dir}")
-        self.assertTrue(os.path.exists(self.midi_dir),
-                       f"MIDI test data directory not found: {self.midi_dir}")
+        assert os.path.exists(cls.test_data_dir), \
+            f"Test data directory not found: {cls.test_data_dir}"
+        assert os.path.exists(cls.midi_dir), \
+            f"MIDI test data directory not found: {cls.midi_dir}"
+
+        cls._base_collection = InMemoryMelodyCollection(cls.midi_dir)
+
+        # One temp root for the whole class; tests carve out subdirectories
+        # so a single rmtree at teardown replaces per-test mkdtemp/rmtree.
+        cls._tmp_root = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temp root."""
+        shutil.rmtree(cls._tmp_root, ignore_errors=True)
+
+    def setUp(self):
+        """Give each test an independent snapshot of the parsed corpus."""
+        self.collection = self._base_collection.snapshot()
 
     def test_directory_initialization(self):
         """Test initialization with a directory containing MIDI files."""
@@ -49,7 +66,7 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_directory_initialization_default_name(self):
         """Test initialization with a directory using default name."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         self.assertEqual(collection.get_name(), "midi")
         self.assertGreater(collection.size(), 0)
@@ -69,7 +86,7 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_add_melody(self):
         """Test adding a melody to the collection."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
         initial_size = collection.size()
 
         # Create a test melody
@@ -85,7 +102,7 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_add_duplicate_melody_raises_error(self):
         """Test that adding a melody with duplicate ID raises ValueError."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         test_melody1 = Melody("duplicate_id")
         test_melody2 = Melody("duplicate_id")
@@ -97,14 +114,14 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_get_nonexistent_melody_raises_error(self):
         """Test that getting a nonexistent melody raises KeyError."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         with self.assertRaises(KeyError):
             collection.get("nonexistent_melody")
 
     def test_iteration(self):
         """Test iterating over melodies in the collection."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         melody_count = 0
         for melody in collection:
@@ -115,7 +132,7 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_list_melody_ids(self):
         """Test listing all melody IDs."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         melody_ids = collection.list_melody_ids()
         self.assertIsInstance(melody_ids, list)
@@ -127,7 +144,7 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_contains(self):
         """Test checking if melody exists in collection."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         # Add a test melody
         test_melody = Melody("test_contains")
@@ -138,7 +155,7 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_remove_melody(self):
         """Test removing a melody from the collection."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         # Add a test melody
         test_melody = Melody("test_remove")
@@ -153,14 +170,14 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
 
     def test_remove_nonexistent_melody_raises_error(self):
         """Test that removing a nonexistent melody raises KeyError."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         with self.assertRaises(KeyError):
             collection.remove("nonexistent_melody")
 
     def test_clear_collection(self):
         """Test clearing all melodies from the collection."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         # Ensure collection is not empty
         self.assertGreater(collection.size(), 0)
@@ -173,61 +190,63 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
     def test_zip_file_initialization(self):
         """Test initialization with a ZIP file containing MIDI files."""
         # Create a temporary ZIP file with some MIDI files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            zip_path = os.path.join(temp_dir, "test_midi.zip")
-
-            # Get some test MIDI files
-            midi_files = []
-            for file_name in os.listdir(self.midi_dir):
-                if file_name.endswith('.mid'):
-                    midi_files.append(os.path.join(self.midi_dir, file_name))
+        temp_dir = tempfile.mkdtemp(dir=self._tmp_root)
+        zip_path = os.path.join(temp_dir, "test_midi.zip")
+
+        # Get some test MIDI files; scandir entries carry their path
+        # and file type without a stat or join per name
+        midi_files = []
+        with os.scandir(self.midi_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith('.mid'):
+                    midi_files.append(entry.path)
                     if len(midi_files) >= 3:  # Limit to first 3 files
                         break
 
-            # Create ZIP file
-            with zipfile.ZipFile(zip_path, 'w') as zip_file:
-                for midi_file in midi_files:
-                    zip_file.write(midi_file, os.path.basename(midi_file))
+        # Create ZIP file
+        with zipfile.ZipFile(zip_path, 'w') as zip_file:
+            for midi_file in midi_files:
+                zip_file.write(midi_file, os.path.basename(midi_file))
 
-            # Test loading from ZIP
-            collection = InMemoryMelodyCollection(zip_path, "Test ZIP Collection")
+        # Test loading from ZIP
+        collection = InMemoryMelodyCollection(zip_path, "Test ZIP Collection")
 
-            self.assertEqual(collection.get_name(), "Test ZIP Collection")
-            self.assertEqual(collection.size(), len(midi_files))
+        self.assertEqual(collection.get_name(), "Test ZIP Collection")
+        self.assertEqual(collection.size(), len(midi_files))
 
     def test_empty_directory(self):
         """Test initialization with an empty directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            collection = InMemoryMelodyCollection(temp_dir, "Empty Collection")
+        temp_dir = tempfile.mkdtemp(dir=self._tmp_root)
+        collection = InMemoryMelodyCollection(temp_dir, "Empty Collection")
 
-            self.assertEqual(collection.get_name(), "Empty Collection")
-            self.assertEqual(collection.size(), 0)
+        self.assertEqual(collection.get_name(), "Empty Collection")
+        self.assertEqual(collection.size(), 0)
 
     def test_zip_file_with_no_midi_files(self):
         """Test initialization with a ZIP file containing no MIDI files."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            zip_path = os.path.join(temp_dir, "no_midi.zip")
+        temp_dir = tempfile.mkdtemp(dir=self._tmp_root)
+        zip_path = os.path.join(temp_dir, "no_midi.zip")
 
-            # Create ZIP with non-MIDI files
-            with zipfile.ZipFile(zip_path, 'w') as zip_file:
-                zip_file.writestr("test.txt", "This is not a MIDI file")
-                zip_file.writestr("readme.md", "# No MIDI files here")
+        # Create ZIP with non-MIDI files
+        with zipfile.ZipFile(zip_path, 'w') as zip_file:
+            zip_file.writestr("test.txt", "This is not a MIDI file")
+            zip_file.writestr("readme.md", "# No MIDI files here")
 
-            collection = InMemoryMelodyCollection(zip_path, "No MIDI Collection")
+        collection = InMemoryMelodyCollection(zip_path, "No MIDI Collection")
 
-            self.assertEqual(collection.get_name(), "No MIDI Collection")
-            self.assertEqual(collection.size(), 0)
+        self.assertEqual(collection.get_name(), "No MIDI Collection")
+        self.assertEqual(collection.size(), 0)
 
     def test_invalid_zip_file_raises_error(self):
         """Test that initializing with an invalid ZIP file raises ValueError."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create a file with .zip extension but not actually a ZIP file
-            fake_zip_path = os.path.join(temp_dir, "fake.zip")
-            with open(fake_zip_path, 'w') as f:
-                f.write("This is not a ZIP file")
+        temp_dir = tempfile.mkdtemp(dir=self._tmp_root)
+        # Create a file with .zip extension but not actually a ZIP file
+        fake_zip_path = os.path.join(temp_dir, "fake.zip")
+        with open(fake_zip_path, 'w') as f:
+            f.write("This is not a ZIP file")
 
-            with self.assertRaises(ValueError):
-                InMemoryMelodyCollection(fake_zip_path)
+        with self.assertRaises(ValueError):
+            InMemoryMelodyCollection(fake_zip_path)
 
     def test_repr(self):
         """Test string representation of the collection."""
@@ -238,9 +257,79 @@ class TestInMemoryMelodyCollection(unittest.TestCase):
         self.assertIn("Test Repr", repr_str)
         self.assertIn(str(collection.size()), repr_str)
 
+    def test_lazy_collection_get(self):
+        """Test that lazy mode parses melodies on first access."""
+        collection = InMemoryMelodyCollection(self.midi_dir, preload=False)
+
+        self.assertEqual(collection.size(), self._base_collection.size())
+
+        melody_id = collection.list_melody_ids()[0]
+        melody = collection.get(melody_id)
+        self.assertIsInstance(melody, Melody)
+        self.assertEqual(melody.id, melody_id)
+        # The parsed melody is kept; a second get returns the same object
+        self.assertIs(collection.get(melody_id), melody)
+
+    def test_lazy_collection_iteration(self):
+        """Test iterating over a lazily loaded collection."""
+        collection = InMemoryMelodyCollection(self.midi_dir, preload=False)
+
+        melodies = list(collection)
+        self.assertEqual(len(melodies), collection.size())
+        for melody in melodies:
+            self.assertIsInstance(melody, Melody)
+
+    def test_lazy_collection_remove(self):
+        """Test removing a not-yet-parsed melody from a lazy collection."""
+        collection = InMemoryMelodyCollection(self.midi_dir, preload=False)
+        initial_size = collection.size()
+
+        melody_id = collection.list_melody_ids()[0]
+        collection.remove(melody_id)
+
+        self.assertEqual(collection.size(), initial_size - 1)
+        self.assertFalse(collection.contains(melody_id))
+        with self.assertRaises(KeyError):
+            collection.get(melody_id)
+
+    def test_lazy_collection_corrupt_file(self):
+        """Test that a corrupt source is dropped on first lazy access."""
+        temp_dir = tempfile.mkdtemp(dir=self._tmp_root)
+        shutil.copy(os.path.join(self.midi_dir, '0A2A.mid'), temp_dir)
+        with open(os.path.join(temp_dir, 'broken.mid'), 'wb') as f:
+            f.write(b'This is not a MIDI file')
+
+        collection = InMemoryMelodyCollection(temp_dir, preload=False)
+        self.assertEqual(collection.size(), 2)
+
+        # First access fails like an unknown ID; the entry is dropped
+        with self.assertRaises(KeyError):
+            collection.get('broken')
+        self.assertFalse(collection.contains('broken'))
+        self.assertEqual(collection.size(), 1)
+
+        # Iteration skips the corrupt source, as eager loading would
+        collection = InMemoryMelodyCollection(temp_dir, preload=False)
+        melodies = list(collection)
+        self.assertEqual(len(melodies), 1)
+        self.assertEqual(melodies[0].id, '0A2A')
+
+    def test_melody_pickle_round_trip(self):
+        """Test that slotted melodies survive the pickle used by the collection cache."""
+        import pickle
+
+        melody = Melody("pickle_test")
+        melody.add_note(Note(60, 0.0, 1.0, 0.0))
+        melody.add_note(Note(64, 1.5, 0.5, 0.5))
+
+        restored = pickle.loads(pickle.dumps(melody, protocol=5))
+
+        self.assertEqual(restored.id, melody.id)
+        self.assertEqual(restored.notes, melody.notes)
+
     def test_loaded_melodies_have_notes(self):
         """Test that loaded melodies contain notes."""
-        collection = InMemoryMelodyCollection(self.midi_dir)
+        collection = self.collection
 
         if collection.size() > 0:
             # Get the first melody
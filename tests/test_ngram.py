@@ -3,9 +3,12 @@ Unit tests for the NGram class.
 """
 
 import unittest
+import re
 import sys
 import os
 
+import numpy as np
+
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
 
@@ -13,6 +16,9 @@ from splyne.input_handling.note import Note
 from splyne.input_handling.melody import Melody
 from splyne.comparision.ngram import NGram
 
+# Token format of the Java reference output: {pitch,duration,rest_fraction}
+_JAVA_TOKEN_RE = re.compile(r'\{(\d+),(\d+(?:\.\d+)?),([\d\.]+)\}')
+
 
 class TestNGram(unittest.TestCase):
     """Test cases for the NGram class."""
@@ -170,6 +176,39 @@ class TestNGram(unittest.TestCase):
         self.assertNotEqual(ngram1, ngram3)
         self.assertNotEqual(ngram1, "not an ngram")
 
+    def test_hash_all(self):
+        """Test batch n-gram fingerprinting."""
+        hashes = NGram.hash_all(self.melody, 3)
+
+        # One fingerprint per n-gram
+        self.assertEqual(len(hashes), 3)
+
+        # Repeating the melody's notes should repeat the fingerprints
+        repeated = Melody("repeated")
+        for note in self.melody.notes + self.melody.notes:
+            repeated.add_note(note)
+        repeated_hashes = NGram.hash_all(repeated, 3)
+        self.assertEqual(repeated_hashes[0], repeated_hashes[5])
+
+        # Invalid n yields no fingerprints
+        self.assertEqual(len(NGram.hash_all(self.melody, 0)), 0)
+        self.assertEqual(len(NGram.hash_all(self.melody, 10)), 0)
+
+    def test_group(self):
+        """Test hash-based grouping of equal n-grams."""
+        repeated = Melody("repeated")
+        for note in self.melody.notes + self.melody.notes:
+            repeated.add_note(note)
+
+        ngrams = NGram.get_ngrams(repeated, 3)
+        groups = NGram.group(ngrams)
+
+        # The window starting at note 5 repeats the window at note 0
+        self.assertIn([0, 5], list(groups.values()))
+        # Every n-gram is accounted for exactly once
+        all_indices = sorted(i for indices in groups.values() for i in indices)
+        self.assertEqual(all_indices, list(range(len(ngrams))))
+
     def test_repr(self):
         """Test NGram repr method."""
         notes = [self.note1, self.note2]
@@ -184,10 +223,16 @@ class TestNGramIntegration(unittest.TestCase):
 
     """Test NGram implementation against the expected output from Java version."""
 
-    def setUp(self):
-        """Set up test fixtures with Java reference output."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures with Java reference output.
+
+        The reference conversion and reader are class attributes: the
+        expected n-grams are immutable derived data, so they are built
+        once instead of per test method.
+        """
         # Java reference output for 0A2A.mid with n=6
-        self.java_reference_output = [
+        cls.java_reference_output = [
             "{71,48,0.0}{71,48,0.0}{74,48,0.0}{74,48,0.0}{72,96,0.0}{69,96,0.0}",
             "{71,48,0.0}{74,48,0.0}{74,48,0.0}{72,96,0.0}{69,96,0.0}{67,48,0.0}",
             "{74,48,0.0}{74,48,0.0}{72,96,0.0}{69,96,0.0}{67,48,0.0}{69,48,0.0}",
@@ -209,13 +254,14 @@ class TestNGramIntegration(unittest.TestCase):
 
         # Import here to avoid import issues
         from splyne.input_handling.tunes_reader import MidiReader
-        self.midi_reader = MidiReader()
-        self.test_midi_path = os.path.join(os.path.dirname(__file__), 'test_data', 'midi', '0A2A.mid')
+        cls.midi_reader = MidiReader()
+        cls.test_midi_path = os.path.join(os.path.dirname(__file__), 'test_data', 'midi', '0A2A.mid')
 
         # Generate expected NGrams from Java reference with converted durations
-        self.expected_ngrams = self._convert_java_reference_to_ngrams()
+        cls.expected_ngrams = cls._convert_java_reference_to_ngrams()
 
-    def _convert_java_reference_to_ngrams(self):
+    @classmethod
+    def _convert_java_reference_to_ngrams(cls):
         """
         Convert Java reference output strings to expected NGram objects.
         Parses the Java format {pitch,duration_ticks,rest_fraction} and converts
@@ -224,36 +270,26 @@ class TestNGramIntegration(unittest.TestCase):
         Returns:
             List[NGram]: List of expected NGram objects with converted durations.
         """
-        import re
-        from splyne.input_handling.note import Note
+        # One precompiled findall over all lines, then one vectorized
+        # conversion pass, instead of per-token int()/float() calls.
+        matches = _JAVA_TOKEN_RE.findall("\n".join(cls.java_reference_output))
+        n = len(matches) // len(cls.java_reference_output)
+        fields = np.array(matches, dtype=np.float64).reshape(
+            len(cls.java_reference_output), n, 3
+        )
 
         expected_ngrams = []
-
-        for java_ngram_str in self.java_reference_output:
-            # Parse the Java format: {pitch,duration,rest_fraction}{pitch,duration,rest_fraction}...
-            pattern = r'\{(\d+),(\d+(?:\.\d+)?),([\d\.]+)\}'
-            matches = re.findall(pattern, java_ngram_str)
-
-            notes = []
-            for match in matches:
-                pitch = int(match[0])
-                duration_ticks = float(match[1])
-                rest_fraction = float(match[2])
-
-                # Convert duration from MIDI ticks to quarter notes
-                duration_quarter_notes = duration_ticks / 96.0
-
-                # Create Note object (onset doesn't matter for this comparison)
-                note = Note(
-                    pitch=pitch,
-                    onset=0.0,  # Not used in string comparison
-                    duration=duration_quarter_notes,
-                    rest_fraction=rest_fraction
-                )
-                notes.append(note)
-
-            # Create NGram from the converted notes
-            expected_ngrams.append(NGram(notes))
+        for window in fields:
+            # Build each expected n-gram through the array-backed path;
+            # onsets are zero since they are not used in the comparison.
+            melody = Melody(None)
+            melody.add_notes_bulk(
+                window[:, 0].astype(np.int16),
+                np.zeros(n),
+                window[:, 1] / 96.0,  # MIDI ticks to quarter notes
+                window[:, 2]
+            )
+            expected_ngrams.append(NGram.get_ngrams(melody, n)[0])
 
         return expected_ngrams
 
@@ -283,27 +319,26 @@ class TestNGramIntegration(unittest.TestCase):
         self.assertEqual(len(python_output), len(expected_output),
                         f"Different number of n-grams: Python={len(python_output)}, Expected={len(expected_output)}")
 
-        # Compare each n-gram output
-        mismatches = []
-        for i, (python_ngram, expected_ngram) in enumerate(zip(python_output, expected_output)):
-            if python_ngram != expected_ngram:
-                mismatches.append((i, python_ngram, expected_ngram))
-
-        # Print comparison details
-        if mismatches:
+        # One C-level list comparison replaces the per-ngram assert loop;
+        # the detailed mismatch report is only built when it fails.
+        try:
+            self.assertListEqual(python_output, expected_output)
+        except AssertionError:
+            mismatches = [
+                (i, python_ngram, expected_ngram)
+                for i, (python_ngram, expected_ngram)
+                in enumerate(zip(python_output, expected_output))
+                if python_ngram != expected_ngram
+            ]
             print(f"\nFound {len(mismatches)} mismatches:")
             for i, python_ngram, expected_ngram in mismatches[:5]:  # Show first 5 mismatches
                 print(f"  N-gram {i}:")
                 print(f"    Python:   {python_ngram}")
                 print(f"    Expected: {expected_ngram}")
                 print(f"    Java ref: {self.java_reference_output[i]}")
-        else:
-            print("\nAll n-grams match perfectly!")
+            raise
 
-        # Assert that all n-grams match
-        for i, python_ngram, expected_ngram in mismatches:
-            self.assertEqual(python_ngram, expected_ngram,
-                           f"N-gram {i} mismatch:\nPython:   {python_ngram}\nExpected: {expected_ngram}\nJava ref: {self.java_reference_output[i]}")
+        print("\nAll n-grams match perfectly!")
 
     def test_melody_structure_validation(self):
         """Test that the loaded melody has the expected structure."""